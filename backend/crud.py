@@ -1,46 +1,191 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from typing import List, Optional
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import load_only
+from sqlalchemy import Select, func, case, select, insert, update, delete, text
+from typing import AsyncIterator, List, Optional, Union
 from datetime import datetime
+import asyncio
+import functools
+import uuid
 
-from models import Book
+from models import Book, BookStatsCache, books_fts
 from schemas import BookCreate, BookUpdate, BookStats
 
+# Mutators read a book's current state before writing it and derive the
+# stats cache deltas from that read, so writes within this process must not
+# interleave. Across processes, server databases lock the row
+# (SELECT ... FOR UPDATE) and SQLite takes its write lock up front
+# (see _begin_write).
+_write_lock = asyncio.Lock()
 
-def create_book(db: Session, book: BookCreate) -> Book:
+
+def _serialized(func):
+    """
+    Run a CRUD mutator while holding the process-wide write lock
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        async with _write_lock:
+            return await func(*args, **kwargs)
+    return wrapper
+
+
+async def _begin_write(db: AsyncSession) -> None:
+    """
+    Start the session's transaction as a write transaction
+
+    SQLite ignores FOR UPDATE, so a mutator's snapshot read would otherwise
+    run before the database write lock is taken, and another process could
+    change the book before the stats deltas are applied. With this option
+    database.py begins the transaction with BEGIN IMMEDIATE instead.
+    Other databases ignore the option.
+    """
+    await db.connection(execution_options={"sqlite_begin_immediate": True})
+
+
+@_serialized
+async def create_book(db: AsyncSession, book: BookCreate) -> Book:
     """
     Create a new book in the database
     """
-    db_book = Book(**book.model_dump())
+    now = datetime.utcnow()
+    db_book = Book(**book.model_dump(), created_at=now, updated_at=now)
 
     # Set started_at if status is in_progress
     if db_book.status == "in_progress" and not db_book.started_at:
-        db_book.started_at = datetime.now()
+        db_book.started_at = now
 
     # Set completed_at if status is completed
     if db_book.status == "completed" and not db_book.completed_at:
-        db_book.completed_at = datetime.now()
+        db_book.completed_at = now
         db_book.current_page = db_book.total_pages
 
+    await _update_stats_cache(db, after=_stats_snapshot(db_book.status, db_book.current_page, db_book.total_pages))
     db.add(db_book)
-    db.commit()
-    db.refresh(db_book)
+    await db.commit()
+    await db.refresh(db_book)
     return db_book
 
 
-def get_book(db: Session, book_id: int) -> Optional[Book]:
+@_serialized
+async def bulk_create_books(db: AsyncSession, books: List[BookCreate]) -> List[Book]:
+    """
+    Create many books with a single multi-row INSERT ... RETURNING
+
+    Applies the same status defaults as create_book to each row.
+    """
+    if not books:
+        return []
+
+    now = datetime.utcnow()
+    rows = []
+    for book in books:
+        row = book.model_dump()
+        row["created_at"] = row["updated_at"] = now
+        row["started_at"] = now if row["status"] == "in_progress" else None
+        row["completed_at"] = None
+        if row["status"] == "completed":
+            row["completed_at"] = now
+            row["current_page"] = row["total_pages"]
+        rows.append(row)
+
+    snapshots = [_stats_snapshot(row["status"], row["current_page"], row["total_pages"]) for row in rows]
+    await _update_stats_cache(
+        db,
+        after={field: sum(snapshot[field] for snapshot in snapshots) for field in _STATS_FIELDS}
+    )
+    if db.bind.dialect.insert_executemany_returning_sort_by_parameter_order:
+        db_books = (await db.scalars(
+            insert(Book).returning(Book, sort_by_parameter_order=True),
+            rows
+        )).all()
+    else:
+        # Without multi-row RETURNING (e.g. MySQL), the unit of work inserts
+        # row by row so each new id can be read back
+        db_books = [Book(**row) for row in rows]
+        db.add_all(db_books)
+        await db.flush()
+    await db.commit()
+    return db_books
+
+
+async def get_book(db: AsyncSession, book_id: int) -> Optional[Book]:
     """
     Get a single book by ID
     """
-    return db.query(Book).filter(Book.id == book_id).first()
+    return await db.get(Book, book_id)
+
+
+# Columns needed to render BookListResponse
+_SUMMARY_COLUMNS = (
+    Book.id,
+    Book.title,
+    Book.author,
+    Book.total_pages,
+    Book.current_page,
+    Book.status,
+    Book.cover_url,
+    Book.is_favorite,
+    Book.created_at,
+    Book.updated_at,
+)
+
+# Rows fetched per round-trip when streaming books
+_STREAM_BATCH_SIZE = 50
+
+
+def _fts_match_query(search: str) -> str:
+    """
+    Turn a free-text search into an FTS5 query: every word must match
+    as a prefix of a title/author token. Words are quoted so FTS5
+    operators in user input are treated as plain text.
+    """
+    words = [word.replace('"', '""') for word in search.split()]
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _books_query(
+    db: AsyncSession,
+    status: Optional[str] = None,
+    search: Optional[str] = None,
+    summary: bool = False
+) -> Select:
+    """
+    Build the filtered, ordered query shared by get_books and iter_books
+    """
+    query = select(Book)
+    if summary:
+        query = query.options(load_only(*_SUMMARY_COLUMNS))
 
+    # Filter by status if provided
+    if status:
+        query = query.where(Book.status == status)
 
-def get_books(
-    db: Session,
+    # Search in title and author if search term provided
+    # SQLite uses the books_fts index; other databases fall back to LIKE
+    match_query = _fts_match_query(search) if search else ""
+    if match_query and db.bind.dialect.name == "sqlite":
+        query = query.join(books_fts, books_fts.c.rowid == Book.id).where(
+            text("books_fts MATCH :match_query").bindparams(match_query=match_query)
+        )
+    elif search:
+        search_filter = f"%{search.lower()}%"
+        query = query.where(
+            (func.lower(Book.title).like(search_filter))
+            | (func.lower(Book.author).like(search_filter))
+        )
+
+    # Order by updated_at descending (most recently updated first)
+    return query.order_by(Book.updated_at.desc())
+
+
+async def get_books(
+    db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    summary: bool = False
 ) -> List[Book]:
     """
     Get all books with optional filtering and pagination
@@ -51,190 +196,361 @@ def get_books(
         limit: Maximum number of records to return
         status: Filter by status (not_started, in_progress, completed)
         search: Search in title and author
+        summary: Only load the columns used by BookListResponse
     """
-    query = db.query(Book)
+    query = _books_query(db, status=status, search=search, summary=summary)
+    result = await db.scalars(query.offset(skip).limit(limit))
+    return result.all()
 
-    # Filter by status if provided
-    if status:
-        query = query.filter(Book.status == status)
-
-    # Search in title and author if search term provided
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (Book.title.ilike(search_filter)) | (Book.author.ilike(search_filter))
-        )
-
-    # Order by updated_at descending (most recently updated first)
-    query = query.order_by(Book.updated_at.desc())
 
-    return query.offset(skip).limit(limit).all()
+async def iter_books(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    search: Optional[str] = None
+) -> AsyncIterator[Book]:
+    """
+    Iterate over books with the same filtering and pagination as get_books,
+    fetching rows from the database in batches instead of all at once
+    """
+    query = _books_query(db, status=status, search=search)
+    result = await db.stream_scalars(
+        query.offset(skip).limit(limit).execution_options(yield_per=_STREAM_BATCH_SIZE)
+    )
+    async for book in result:
+        yield book
+
+
+# Timestamp actions for a status transition
+_KEEP = "keep"  # Leave the timestamp as it is
+_FILL = "fill"  # Set to now if not already set
+_STAMP = "stamp"  # Always set to now
+
+# (old status, requested status) -> (new status, started_at, completed_at, snap current_page to total_pages)
+_STATUS_TRANSITIONS = {
+    ("not_started", "not_started"): ("not_started", _KEEP, _KEEP, False),
+    ("in_progress", "not_started"): ("not_started", _KEEP, _KEEP, False),
+    ("completed", "not_started"): ("not_started", _KEEP, _KEEP, False),
+    ("not_started", "in_progress"): ("in_progress", _FILL, _KEEP, False),
+    ("in_progress", "in_progress"): ("in_progress", _KEEP, _KEEP, False),
+    ("completed", "in_progress"): ("in_progress", _FILL, _KEEP, False),
+    ("not_started", "completed"): ("completed", _KEEP, _STAMP, True),
+    ("in_progress", "completed"): ("completed", _KEEP, _STAMP, True),
+    ("completed", "completed"): ("completed", _KEEP, _KEEP, False),
+}
+
+# Progress region of a new current_page -> same shape as _STATUS_TRANSITIONS
+_PROGRESS_TRANSITIONS = {
+    "zero": ("not_started", _KEEP, _KEEP, False),
+    "partial": ("in_progress", _FILL, _KEEP, False),
+    "done": ("completed", _KEEP, _FILL, False),
+}
+
+
+def _progress_region(current_page: int, total_pages: int) -> str:
+    """
+    Classify a page position as "zero", "partial" or "done"
+    """
+    if current_page == 0:
+        return "zero"
+    if current_page < total_pages:
+        return "partial"
+    return "done"
 
 
-def update_book(db: Session, book_id: int, book_update: BookUpdate) -> Optional[Book]:
+@_serialized
+async def update_book(db: AsyncSession, book_id: int, book_update: BookUpdate) -> Optional[Book]:
     """
     Update a book's information
     """
-    db_book = get_book(db, book_id)
+    await _begin_write(db)
+    db_book = await db.get(Book, book_id, with_for_update=True)
     if not db_book:
         return None
 
     update_data = book_update.model_dump(exclude_unset=True)
+    if not update_data:
+        return db_book
 
-    # Handle status changes
+    now = datetime.utcnow()
+    before = _stats_snapshot(db_book.status, db_book.current_page, db_book.total_pages)
+
+    # Work out the status transition: an explicit status wins, otherwise
+    # a current_page change moves the book into the matching status
+    transition = None
     if "status" in update_data:
-        new_status = update_data["status"]
-
-        # Set started_at when moving to in_progress
-        if new_status == "in_progress" and db_book.status != "in_progress":
-            if not db_book.started_at:
-                db_book.started_at = datetime.utcnow()
-
-        # Set completed_at when moving to completed
-        if new_status == "completed" and db_book.status != "completed":
-            db_book.completed_at = datetime.utcnow()
-            # Ensure current_page is set to total_pages
-            if "current_page" not in update_data:
-                db_book.current_page = db_book.total_pages
-
-    # Handle current_page changes to auto-update status
-    if "current_page" in update_data:
-        current_page = update_data["current_page"]
+        transition = _STATUS_TRANSITIONS[(db_book.status, update_data["status"])]
+    elif "current_page" in update_data:
         total_pages = update_data.get("total_pages", db_book.total_pages)
-
-        # Auto-update status based on progress
-        if current_page == 0 and "status" not in update_data:
-            db_book.status = "not_started"
-        elif current_page > 0 and current_page < total_pages and "status" not in update_data:
-            db_book.status = "in_progress"
-            if not db_book.started_at:
-                db_book.started_at = datetime.utcnow()
-        elif current_page >= total_pages and "status" not in update_data:
-            db_book.status = "completed"
-            if not db_book.completed_at:
-                db_book.completed_at = datetime.utcnow()
+        transition = _PROGRESS_TRANSITIONS[_progress_region(update_data["current_page"], total_pages)]
+
+    if transition:
+        new_status, started, completed, snap_page = transition
+        db_book.status = new_status
+        if started == _FILL and not db_book.started_at:
+            db_book.started_at = now
+        if completed == _STAMP or (completed == _FILL and not db_book.completed_at):
+            db_book.completed_at = now
+        # Ensure current_page is set to total_pages
+        if snap_page and "current_page" not in update_data:
+            db_book.current_page = update_data.get("total_pages", db_book.total_pages)
 
     # Update all fields from update_data
     for field, value in update_data.items():
         setattr(db_book, field, value)
 
-    db_book.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_book)
+    # Skip the write entirely when the update matches what is stored
+    if not db.is_modified(db_book):
+        return db_book
+
+    db_book.updated_at = now
+    await _update_stats_cache(db, before=before, after=_stats_snapshot(db_book.status, db_book.current_page, db_book.total_pages))
+    await db.commit()
+    await db.refresh(db_book)
     return db_book
 
 
-def update_book_progress(db: Session, book_id: int, current_page: int) -> Optional[Book]:
+@_serialized
+async def update_book_progress(db: AsyncSession, book_id: int, current_page: int) -> Optional[Book]:
     """
     Update book reading progress
     """
-    db_book = get_book(db, book_id)
+    await _begin_write(db)
+    db_book = (await db.execute(
+        select(Book.total_pages, Book.current_page, Book.status, Book.started_at, Book.completed_at)
+        .where(Book.id == book_id)
+        .with_for_update()
+    )).first()
     if not db_book:
         return None
 
+    now = datetime.utcnow()
+
     # Ensure current_page doesn't exceed total_pages
     current_page = min(current_page, db_book.total_pages)
-    db_book.current_page = current_page
+    values = {"current_page": current_page}
 
     # Auto-update status based on progress
     if current_page == 0:
-        db_book.status = "not_started"
-        db_book.started_at = None
-        db_book.completed_at = None
+        values["status"] = "not_started"
+        values["started_at"] = None
+        values["completed_at"] = None
     elif current_page < db_book.total_pages:
-        db_book.status = "in_progress"
-        if not db_book.started_at:
-            db_book.started_at = datetime.utcnow()
-        db_book.completed_at = None
+        values["status"] = "in_progress"
+        values["started_at"] = db_book.started_at or now
+        values["completed_at"] = None
     else:  # current_page >= total_pages
-        db_book.status = "completed"
-        if not db_book.started_at:
-            db_book.started_at = datetime.utcnow()
-        if not db_book.completed_at:
-            db_book.completed_at = datetime.utcnow()
-
-    db_book.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_book)
-    return db_book
+        values["status"] = "completed"
+        values["started_at"] = db_book.started_at or now
+        values["completed_at"] = db_book.completed_at or now
+
+    values["updated_at"] = now
+    await _update_stats_cache(
+        db,
+        before=_stats_snapshot(db_book.status, db_book.current_page, db_book.total_pages),
+        after=_stats_snapshot(values["status"], current_page, db_book.total_pages)
+    )
+    await db.execute(
+        update(Book).where(Book.id == book_id).values(**values),
+        execution_options={"synchronize_session": False}
+    )
+    await db.commit()
+    return await get_book(db, book_id)
 
 
-def update_book_notes(db: Session, book_id: int, notes: str) -> Optional[Book]:
+async def update_book_notes(db: AsyncSession, book_id: int, notes: str) -> Optional[Book]:
     """
     Update book notes
     """
-    db_book = get_book(db, book_id)
-    if not db_book:
+    result = await db.execute(
+        update(Book).where(Book.id == book_id).values(notes=notes, updated_at=datetime.utcnow()),
+        execution_options={"synchronize_session": False}
+    )
+    if result.rowcount == 0:
         return None
 
-    db_book.notes = notes
-    db_book.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_book)
-    return db_book
+    await _update_stats_cache(db)
+    await db.commit()
+    return await get_book(db, book_id)
 
 
-def delete_book(db: Session, book_id: int) -> bool:
+@_serialized
+async def delete_book(db: AsyncSession, book_id: int) -> bool:
     """
     Delete a book from the database
     """
-    db_book = get_book(db, book_id)
+    await _begin_write(db)
+    db_book = (await db.execute(
+        select(Book.status, Book.current_page, Book.total_pages)
+        .where(Book.id == book_id)
+        .with_for_update()
+    )).first()
     if not db_book:
         return False
 
-    db.delete(db_book)
-    db.commit()
+    await _update_stats_cache(db, before=_stats_snapshot(db_book.status, db_book.current_page, db_book.total_pages))
+    result = await db.execute(
+        delete(Book).where(Book.id == book_id),
+        execution_options={"synchronize_session": False}
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        return False
+
+    await db.commit()
     return True
 
 
-def get_reading_stats(db: Session) -> BookStats:
+# Counters maintained in BookStatsCache, in BookStats field order
+_STATS_FIELDS = (
+    "total_books",
+    "books_in_progress",
+    "books_completed",
+    "books_not_started",
+    "total_pages_read",
+    "total_progress",
+)
+
+_STATS_CACHE_ID = 1
+
+
+def _stats_snapshot(status: str, current_page: Optional[int], total_pages: int) -> dict:
     """
-    Get overall reading statistics
+    Get a book's contribution to each of the cached statistics counters
+    """
+    current_page = current_page or 0
+    return {
+        "total_books": 1,
+        "books_in_progress": int(status == "in_progress"),
+        "books_completed": int(status == "completed"),
+        "books_not_started": int(status == "not_started"),
+        "total_pages_read": current_page,
+        "total_progress": (current_page * 100.0) / total_pages if total_pages > 0 else 0.0,
+    }
+
+
+async def _aggregate_stats(db: Union[AsyncSession, AsyncConnection]) -> dict:
     """
-    total_books = db.query(func.count(Book.id)).scalar()
+    Compute the statistics counters from scratch over the books table
 
-    # Count books by status
-    status_counts = db.query(
-        Book.status,
-        func.count(Book.id)
-    ).group_by(Book.status).all()
+    All metrics are computed with conditional aggregates in a single query.
+    """
+    row = (await db.execute(select(
+        func.count(Book.id),
+        func.sum(case((Book.status == "in_progress", 1), else_=0)),
+        func.sum(case((Book.status == "completed", 1), else_=0)),
+        func.sum(case((Book.status == "not_started", 1), else_=0)),
+        func.sum(Book.current_page),
+        func.sum(Book.progress_percentage)
+    ))).one()
+    return {field: value or 0 for field, value in zip(_STATS_FIELDS, row)}
+
+
+async def seed_stats_cache(db: Union[AsyncSession, AsyncConnection]) -> None:
+    """
+    Create the statistics cache row from the current contents of the books table,
+    unless it already exists. Called by init_db; the caller is responsible for committing.
 
-    status_dict = {status: count for status, count in status_counts}
+    The insert ignores an existing row, so concurrent callers (e.g. several
+    workers starting at once) cannot fail on the primary key.
 
-    books_not_started = status_dict.get("not_started", 0)
-    books_in_progress = status_dict.get("in_progress", 0)
-    books_completed = status_dict.get("completed", 0)
+    Each new row gets a random epoch, so data versions (and the ETags built
+    from them) never repeat when the database or the row is recreated.
+    """
+    values = {"id": _STATS_CACHE_ID, "epoch": uuid.uuid4().hex, **await _aggregate_stats(db)}
+    dialect = db.bind.dialect.name if isinstance(db, AsyncSession) else db.dialect.name
+    if dialect == "sqlite":
+        statement = sqlite.insert(BookStatsCache).values(values).on_conflict_do_nothing()
+    elif dialect == "postgresql":
+        statement = postgresql.insert(BookStatsCache).values(values).on_conflict_do_nothing()
+    else:
+        statement = insert(BookStatsCache).values(values).prefix_with("IGNORE")
+    await db.execute(statement)
 
-    # Calculate total pages read
-    total_pages_read = db.query(func.sum(Book.current_page)).scalar() or 0
+
+async def _update_stats_cache(db: AsyncSession, before: Optional[dict] = None, after: Optional[dict] = None) -> None:
+    """
+    Apply the difference between two book snapshots to the statistics cache
+
+    Every write calls this, even with no counter changes, because the same
+    UPDATE bumps the row's data version that read caches and ETags key on.
+
+    Call this before the book change is written, so that a missing cache
+    row is seeded from the pre-change state of the books table. The row is
+    only seeded when the UPDATE finds nothing to change.
+
+    Args:
+        db: Database session
+        before: Snapshot of the book before the change (None when creating)
+        after: Snapshot of the book after the change (None when deleting)
+    """
+    before = before or {}
+    after = after or {}
+
+    values = {"version": BookStatsCache.version + 1}
+    for field in _STATS_FIELDS:
+        delta = after.get(field, 0) - before.get(field, 0)
+        if delta:
+            values[field] = getattr(BookStatsCache, field) + delta
+
+    statement = update(BookStatsCache).where(BookStatsCache.id == _STATS_CACHE_ID).values(**values)
+    result = await db.execute(statement, execution_options={"synchronize_session": False})
+    if result.rowcount == 0:
+        await seed_stats_cache(db)
+        await db.execute(statement, execution_options={"synchronize_session": False})
+
+
+async def get_data_version(db: AsyncSession) -> Optional[str]:
+    """
+    Get a token that changes on every write to the books table
+
+    Built from the statistics cache row's epoch and version, so it is shared
+    by every process using the database. None if the row does not exist.
+    """
+    row = (await db.execute(
+        select(BookStatsCache.epoch, BookStatsCache.version).where(BookStatsCache.id == _STATS_CACHE_ID)
+    )).first()
+    if row is None:
+        return None
+    return f"{row.epoch}-{row.version}"
+
+
+async def get_reading_stats(db: AsyncSession) -> BookStats:
+    """
+    Get overall reading statistics
+
+    Reads the precomputed counters from the statistics cache.
+    """
+    cache = await db.get(BookStatsCache, _STATS_CACHE_ID, populate_existing=True)
+    if cache is None:
+        # init_db seeds the row; without it, compute the counters but don't
+        # write from a read (it would race the seeding in _update_stats_cache)
+        stats = await _aggregate_stats(db)
+    else:
+        stats = {field: getattr(cache, field) for field in _STATS_FIELDS}
+
+    total_books = stats.pop("total_books")
+    total_progress = stats.pop("total_progress")
 
     # Calculate average progress
     if total_books > 0:
-        # Get sum of all progress percentages
-        total_progress = db.query(
-            func.sum(
-                case(
-                    (Book.total_pages > 0, (Book.current_page * 100.0) / Book.total_pages),
-                    else_=0
-                )
-            )
-        ).scalar() or 0
         average_progress = round(total_progress / total_books, 2)
     else:
         average_progress = 0.0
 
     return BookStats(
         total_books=total_books,
-        books_in_progress=books_in_progress,
-        books_completed=books_completed,
-        books_not_started=books_not_started,
-        total_pages_read=int(total_pages_read),
-        average_progress=average_progress
+        average_progress=average_progress,
+        **stats
     )
 
 
-def get_favorite_books(db: Session) -> List[Book]:
+async def get_favorite_books(db: AsyncSession) -> List[Book]:
     """
     Get all favorite books
     """
-    return db.query(Book).filter(Book.is_favorite == True).order_by(Book.updated_at.desc()).all()
\ No newline at end of file
+    result = await db.scalars(
+        select(Book).where(Book.is_favorite == True).order_by(Book.updated_at.desc())
+    )
+    return result.all()
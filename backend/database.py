@@ -1,61 +1,198 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy import MetaData, String, event, inspect, make_url, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.schema import CreateIndex, CreateTable
+from typing import AsyncGenerator
 import os
 
 # Database configuration
 # Use environment variable or default to SQLite
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./reading_tracker.db")
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./reading_tracker.db")
 
-# For SQLite, we need to enable check_same_thread=False
-# For other databases, this won't have an effect
-connect_args = {}
+# Route plain URLs through an async driver (aiosqlite/asyncpg must be installed)
+ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+}
+for prefix, async_prefix in ASYNC_DRIVERS.items():
+    if DATABASE_URL.startswith(prefix):
+        DATABASE_URL = async_prefix + DATABASE_URL[len(prefix):]
+
+# Connection pooling: server databases (PostgreSQL/MySQL) get an explicit
+# pool size and a liveness check on checkout. aiosqlite file databases would
+# default to NullPool (a new connection per checkout), so they use a queue
+# pool without pre-ping, since a local file connection cannot go stale;
+# in-memory databases keep the dialect default (one shared connection, as
+# each new connection would open its own empty database)
+url = make_url(DATABASE_URL)
+sqlite_file = url.get_backend_name() == "sqlite" and not (
+    url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+)
+pool_args = {}
 if DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+    if sqlite_file:
+        pool_args = {"poolclass": AsyncAdaptedQueuePool}
+else:
+    pool_args = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_pre_ping": True,  # Discard stale connections before use
+    }
 
 # Create engine
-engine = create_engine(
+engine = create_async_engine(
     DATABASE_URL,
-    connect_args=connect_args,
-    echo=False  # Set to True for SQL query logging
+    query_cache_size=1200,  # Compiled statement cache entries
+    echo=False,  # Set to True for SQL query logging (shows statement cache hits)
+    **pool_args
 )
 
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        Tune each new SQLite connection: WAL lets readers run alongside a
+        writer, and synchronous=NORMAL is durable enough under WAL while
+        fsyncing far less often.
+
+        Runs once per pooled connection, not per request; this relies on
+        the queue pool configured above.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        cursor.close()
+
+# Only file databases can be shared with other processes. An in-memory
+# database has a single connection that concurrent sessions share, so it
+# keeps the driver's implicit transactions rather than explicit BEGINs.
+if sqlite_file:
+    @event.listens_for(engine.sync_engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        """Leave transaction control to begin_sqlite_transaction below"""
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def begin_sqlite_transaction(conn):
+        """
+        Emit BEGIN for each SQLite transaction. Mutators that read before
+        they write ask for BEGIN IMMEDIATE (crud._begin_write), which takes
+        the database write lock before the read rather than at the first
+        write, so the read cannot go stale under writes from other processes.
+        """
+        if conn.get_execution_options().get("sqlite_begin_immediate"):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            conn.exec_driver_sql("BEGIN")
+
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False so attributes stay readable after commit without
+# an implicit (and, under asyncio, unsupported) lazy refresh
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency function to get database session.
     Use this in FastAPI route dependencies.
 
     Example:
         @app.get("/books")
-        def get_books(db: Session = Depends(get_db)):
+        async def get_books(db: AsyncSession = Depends(get_db)):
             ...
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db():
+async def init_db():
     """
     Initialize database - create all tables.
     Call this when starting the application.
     """
-    from models import Base
-    Base.metadata.create_all(bind=engine)
+    from models import Base, BOOKS_TRGM_DDL
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await _migrate_status_codes(conn)
+
+        # create_all skips tables that already exist, so add any indexes
+        # that were introduced after the table was first created
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                await conn.execute(CreateIndex(index, if_not_exists=True))
+        if engine.dialect.name == "postgresql":
+            for statement in BOOKS_TRGM_DDL:
+                await conn.execute(text(statement))
+
+        if engine.dialect.name == "sqlite":
+            await _init_sqlite_fts(conn)
+
+        # Seed the statistics cache row here rather than on first read
+        from crud import seed_stats_cache
+        await seed_stats_cache(conn)
     print("Database initialized successfully!")
 
 
-def drop_db():
+async def _migrate_status_codes(conn):
+    """
+    Convert books.status from the legacy status-name strings to StatusCode integers.
+    Does nothing once the column holds integer codes.
+    """
+    from models import Book, StatusCode
+    columns = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_columns("books"))
+    status_type = next(column["type"] for column in columns if column["name"] == "status")
+    if not isinstance(status_type, String):
+        return
+
+    codes = " ".join(f"WHEN '{code.name.lower()}' THEN {code.value}" for code in StatusCode)
+    if engine.dialect.name == "postgresql":
+        await conn.execute(text(
+            f"ALTER TABLE books ALTER COLUMN status TYPE SMALLINT USING CASE status {codes} END"
+        ))
+    elif engine.dialect.name == "sqlite":
+        # SQLite cannot change a column type in place, so rebuild the table.
+        # Dropping books also drops its indexes and FTS triggers; init_db
+        # recreates them after this runs. Ids are kept, so books_fts stays valid.
+        books_new = Book.__table__.to_metadata(MetaData(), name="books_new")
+        await conn.execute(CreateTable(books_new))
+        names = ", ".join(column["name"] for column in columns)
+        values = ", ".join(
+            f"CASE status {codes} END" if column["name"] == "status" else column["name"]
+            for column in columns
+        )
+        await conn.execute(text(f"INSERT INTO books_new ({names}) SELECT {values} FROM books"))
+        await conn.execute(text("DROP TABLE books"))
+        await conn.execute(text("ALTER TABLE books_new RENAME TO books"))
+    else:
+        await conn.execute(text(f"UPDATE books SET status = CASE status {codes} END"))
+        await conn.execute(text("ALTER TABLE books MODIFY status SMALLINT"))
+
+
+async def _init_sqlite_fts(conn):
+    """
+    Create the books_fts full-text index and its sync triggers,
+    indexing any existing books the first time it is created.
+    """
+    from models import BOOKS_FTS_DDL
+    exists = (await conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'")
+    )).first()
+    for statement in BOOKS_FTS_DDL:
+        await conn.execute(text(statement))
+    if not exists:
+        await conn.execute(text("INSERT INTO books_fts(books_fts) VALUES ('rebuild')"))
+
+
+async def drop_db():
     """
     Drop all tables - use with caution!
     Useful for development/testing.
     """
     from models import Base
-    Base.metadata.drop_all(bind=engine)
-    print("Database dropped successfully!")
\ No newline at end of file
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        if engine.dialect.name == "sqlite":
+            await conn.execute(text("DROP TABLE IF EXISTS books_fts"))
+    print("Database dropped successfully!")
@@ -1,17 +1,20 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import crud
 import schemas
-from database import get_db, init_db
+from database import SessionLocal, get_db, init_db
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Reading Progress Tracker API",
     description="API for tracking reading progress of books and articles",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS to allow frontend to communicate with backend
@@ -24,10 +27,67 @@ app.add_middleware(
 )
 
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check whether an If-None-Match header matches the given ETag"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+# Built once per process; list endpoints validate and serialize through these
+# directly instead of FastAPI's per-request response_model handling
+BOOKS_ADAPTER = TypeAdapter(List[schemas.BookResponse])
+BOOK_SUMMARIES_ADAPTER = TypeAdapter(List[schemas.BookListResponse])
+
+
+def encode_list(adapter: TypeAdapter, books: List[Any]) -> bytes:
+    """Serialize ORM rows to a JSON array with a prebuilt TypeAdapter"""
+    return adapter.dump_json(adapter.validate_python(books, from_attributes=True))
+
+
+def list_json_response(adapter: TypeAdapter, books: List[Any]) -> Response:
+    """Serialize ORM rows to a JSON array response with a prebuilt TypeAdapter"""
+    return Response(content=encode_list(adapter, books), media_type="application/json")
+
+
+# Encoded bodies of slowly-changing reads, keyed by endpoint and stored with
+# the data version they were read at (see crud.get_data_version). Every write
+# changes that version in the database, so entries go stale in every worker.
+READ_CACHE: Dict[str, Tuple[str, bytes]] = {}
+
+
+async def cached_json_response(
+    key: str,
+    data_version: Optional[str],
+    if_none_match: Optional[str],
+    load: Callable[[], Awaitable[bytes]]
+) -> Response:
+    """
+    Respond with a JSON body cached per data version, with a weak ETag built
+    from the version, or 304 Not Modified when If-None-Match already matches it
+
+    load is only awaited when the cached body is missing or stale.
+    """
+    if data_version is None:
+        return Response(content=await load(), media_type="application/json")
+    etag = f'W/"{data_version}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    cached = READ_CACHE.get(key)
+    if cached is not None and cached[0] == data_version:
+        content = cached[1]
+    else:
+        content = await load()
+        READ_CACHE[key] = (data_version, content)
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
-    init_db()
+    await init_db()
     print("=� Reading Progress Tracker API is running!")
 
 
@@ -46,7 +106,7 @@ async def root():
 @app.post("/books", response_model=schemas.BookResponse, status_code=201)
 async def create_book(
     book: schemas.BookCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new book
@@ -62,16 +122,36 @@ async def create_book(
     - **rating**: Book rating 0-5 (optional)
     - **is_favorite**: Mark as favorite (default: false)
     """
-    return crud.create_book(db=db, book=book)
+    return await crud.create_book(db=db, book=book)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def stream_books_ndjson(**filters) -> AsyncIterator[str]:
+    """
+    Stream books as newline-delimited JSON, one BookResponse per line.
+
+    Uses its own session because dependencies with yield are closed
+    before a streaming response body is sent.
+    """
+    async with SessionLocal() as db:
+        async for book in crud.iter_books(db=db, **filters):
+            yield schemas.BookResponse.model_validate(book).model_dump_json() + "\n"
 
 
-@app.get("/books", response_model=List[schemas.BookResponse])
+@app.get(
+    "/books",
+    response_model=List[schemas.BookResponse],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}}
+)
 async def get_books(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of records"),
-    status: Optional[str] = Query(None, description="Filter by status"),
+    status: Optional[schemas.Status] = Query(None, description="Filter by status"),
     search: Optional[str] = Query(None, description="Search in title and author"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all books with optional filtering
@@ -80,24 +160,75 @@ async def get_books(
     - **limit**: Maximum number of books to return
     - **status**: Filter by status (not_started, in_progress, completed)
     - **search**: Search in title and author fields
+
+    Send `Accept: application/x-ndjson` to stream the books as
+    newline-delimited JSON instead of a single JSON array.
+    """
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            stream_books_ndjson(skip=skip, limit=limit, status=status, search=search),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    books = await crud.get_books(db=db, skip=skip, limit=limit, status=status, search=search)
+    return list_json_response(BOOKS_ADAPTER, books)
+
+
+@app.post("/books/bulk", response_model=List[schemas.BookResponse], status_code=201)
+async def bulk_create_books(
+    books: List[schemas.BookCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many books in one request
+
+    Takes a list of books with the same fields as POST /books and inserts
+    them in a single statement.
     """
-    return crud.get_books(db=db, skip=skip, limit=limit, status=status, search=search)
+    return await crud.bulk_create_books(db=db, books=books)
+
+
+@app.get("/books/summary", response_model=List[schemas.BookListResponse])
+async def get_book_summaries(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=100, description="Maximum number of records"),
+    status: Optional[schemas.Status] = Query(None, description="Filter by status"),
+    search: Optional[str] = Query(None, description="Search in title and author"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a lightweight listing of books, without notes and other detail fields
+
+    Accepts the same filters as GET /books.
+    """
+    books = await crud.get_books(db=db, skip=skip, limit=limit, status=status, search=search, summary=True)
+    return list_json_response(BOOK_SUMMARIES_ADAPTER, books)
 
 
 @app.get("/books/favorites", response_model=List[schemas.BookResponse])
-async def get_favorite_books(db: Session = Depends(get_db)):
-    """Get all favorite books"""
-    return crud.get_favorite_books(db=db)
+async def get_favorite_books(
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get all favorite books
+
+    Responds with 304 Not Modified when If-None-Match matches the current ETag.
+    """
+    async def load() -> bytes:
+        return encode_list(BOOKS_ADAPTER, await crud.get_favorite_books(db=db))
+
+    data_version = await crud.get_data_version(db=db)
+    return await cached_json_response("favorites", data_version, if_none_match, load)
 
 
 @app.get("/books/{book_id}", response_model=schemas.BookResponse)
-async def get_book(book_id: int, db: Session = Depends(get_db)):
+async def get_book(book_id: int, db: AsyncSession = Depends(get_db)):
     """
     Get a single book by ID
 
     - **book_id**: Book ID
     """
-    db_book = crud.get_book(db=db, book_id=book_id)
+    db_book = await crud.get_book(db=db, book_id=book_id)
     if db_book is None:
         raise HTTPException(status_code=404, detail="Book not found")
     return db_book
@@ -107,7 +238,7 @@ async def get_book(book_id: int, db: Session = Depends(get_db)):
 async def update_book(
     book_id: int,
     book_update: schemas.BookUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update a book's information
@@ -115,7 +246,7 @@ async def update_book(
     - **book_id**: Book ID
     - All fields are optional - only send fields you want to update
     """
-    db_book = crud.update_book(db=db, book_id=book_id, book_update=book_update)
+    db_book = await crud.update_book(db=db, book_id=book_id, book_update=book_update)
     if db_book is None:
         raise HTTPException(status_code=404, detail="Book not found")
     return db_book
@@ -125,7 +256,7 @@ async def update_book(
 async def update_book_progress(
     book_id: int,
     progress: schemas.ProgressUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update reading progress for a book
@@ -135,7 +266,7 @@ async def update_book_progress(
 
     This will automatically update the book's status based on progress.
     """
-    db_book = crud.update_book_progress(
+    db_book = await crud.update_book_progress(
         db=db,
         book_id=book_id,
         current_page=progress.current_page
@@ -149,7 +280,7 @@ async def update_book_progress(
 async def update_book_notes(
     book_id: int,
     notes_update: schemas.NotesUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update notes for a book
@@ -157,7 +288,7 @@ async def update_book_notes(
     - **book_id**: Book ID
     - **notes**: Reading notes and highlights
     """
-    db_book = crud.update_book_notes(
+    db_book = await crud.update_book_notes(
         db=db,
         book_id=book_id,
         notes=notes_update.notes
@@ -168,13 +299,13 @@ async def update_book_notes(
 
 
 @app.delete("/books/{book_id}", status_code=204)
-async def delete_book(book_id: int, db: Session = Depends(get_db)):
+async def delete_book(book_id: int, db: AsyncSession = Depends(get_db)):
     """
     Delete a book
 
     - **book_id**: Book ID
     """
-    success = crud.delete_book(db=db, book_id=book_id)
+    success = await crud.delete_book(db=db, book_id=book_id)
     if not success:
         raise HTTPException(status_code=404, detail="Book not found")
     return None
@@ -183,7 +314,10 @@ async def delete_book(book_id: int, db: Session = Depends(get_db)):
 # ==================== Statistics Endpoints ====================
 
 @app.get("/stats", response_model=schemas.BookStats)
-async def get_stats(db: Session = Depends(get_db)):
+async def get_stats(
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Get overall reading statistics
 
@@ -192,8 +326,14 @@ async def get_stats(db: Session = Depends(get_db)):
     - Books by status (not_started, in_progress, completed)
     - Total pages read
     - Average progress across all books
+
+    Responds with 304 Not Modified when If-None-Match matches the current ETag.
     """
-    return crud.get_reading_stats(db=db)
+    async def load() -> bytes:
+        return (await crud.get_reading_stats(db=db)).model_dump_json().encode()
+
+    data_version = await crud.get_data_version(db=db)
+    return await cached_json_response("stats", data_version, if_none_match, load)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,81 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, DateTime, Text, Boolean, Index, case, column, event, table
+from sqlalchemy.exc import ArgumentError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
+from enum import IntEnum
 
 Base = declarative_base()
 
+# Relationship loading convention: every relationship() must pass
+# lazy="selectin" (collections) or lazy="joined" (one-to-one), or "raise"
+# to forbid implicit loads. The default lazy="select" issues one query per
+# parent row on list endpoints (N+1), and cannot run under AsyncSession.
+#
+#     tags = relationship("Tag", secondary=book_tags, lazy="selectin")
+ALLOWED_RELATIONSHIP_LAZY = {"selectin", "joined", "raise", "raise_on_sql"}
+
+
+@event.listens_for(Base, "mapper_configured", propagate=True)
+def check_relationship_loading(mapper, class_):
+    """Reject relationships that fall back to per-row lazy loading"""
+    for relationship in mapper.relationships:
+        if relationship.lazy not in ALLOWED_RELATIONSHIP_LAZY:
+            raise ArgumentError(
+                f"{class_.__name__}.{relationship.key} uses lazy={relationship.lazy!r}; "
+                f"relationships must use one of {sorted(ALLOWED_RELATIONSHIP_LAZY)}"
+            )
+
+
+class utcnow(FunctionElement):
+    """
+    Current time as naive UTC, matching the datetime.utcnow() values the
+    CRUD layer stores. SQLite's CURRENT_TIMESTAMP is already UTC; MySQL's
+    follows the session time_zone, which must be UTC.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    # now() is in the server's TimeZone; convert before dropping the zone
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+class StatusCode(IntEnum):
+    """Storage codes for Book.status"""
+    NOT_STARTED = 0
+    IN_PROGRESS = 1
+    COMPLETED = 2
+
+
+class StatusType(TypeDecorator):
+    """
+    Stores a reading status name ("not_started", "in_progress", "completed")
+    as its StatusCode integer. Python code and the API keep using the names.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        return StatusCode[value.upper()].value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return StatusCode(value).name.lower()
+
 
 class Book(Base):
     """
@@ -16,7 +88,7 @@ class Book(Base):
     author = Column(String(255), nullable=False)
     total_pages = Column(Integer, nullable=False)
     current_page = Column(Integer, default=0)
-    status = Column(String(50), default="not_started")  # not_started, in_progress, completed
+    status = Column(StatusType, default="not_started")  # not_started, in_progress, completed
     cover_url = Column(String(500), nullable=True)
     genre = Column(String(100), nullable=True)
     notes = Column(Text, nullable=True)
@@ -24,17 +96,97 @@ class Book(Base):
     is_favorite = Column(Boolean, default=False)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # The CRUD layer stamps these explicitly; the server defaults cover rows
+    # written outside the ORM on databases created with this schema
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=utcnow())
 
-    @property
+    @hybrid_property
     def progress_percentage(self) -> float:
         """Calculate reading progress percentage"""
         if self.total_pages == 0:
             return 0.0
         return round((self.current_page / self.total_pages) * 100, 2)
 
-    @property
+    @progress_percentage.expression
+    def progress_percentage(cls):
+        """SQL form of progress_percentage (unrounded, for aggregates)"""
+        return case(
+            (cls.total_pages > 0, (cls.current_page * 100.0) / cls.total_pages),
+            else_=0.0
+        )
+
+    @hybrid_property
     def pages_remaining(self) -> int:
         """Calculate remaining pages"""
-        return max(0, self.total_pages - self.current_page)
\ No newline at end of file
+        return max(0, self.total_pages - self.current_page)
+
+    @pages_remaining.expression
+    def pages_remaining(cls):
+        """SQL form of pages_remaining"""
+        return case(
+            (cls.total_pages > cls.current_page, cls.total_pages - cls.current_page),
+            else_=0
+        )
+
+
+# Trigram indexes backing case-insensitive title/author search on PostgreSQL.
+# The %term% LIKE search cannot use a btree index; pg_trgm GIN indexes serve it.
+# Created by init_db on PostgreSQL only.
+BOOKS_TRGM_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_books_title_trgm ON books USING gin (lower(title) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_books_author_trgm ON books USING gin (lower(author) gin_trgm_ops)",
+)
+
+# Status filter + updated_at ordering used by get_books (also serves status-only lookups)
+Index("ix_books_status_updated", Book.status, Book.updated_at)
+
+# Partial index over favorites only, ordered for get_favorite_books.
+# The predicate must match the query's filter for the planner to use it.
+Index(
+    "ix_books_fav_updated",
+    Book.updated_at,
+    postgresql_where=Book.is_favorite == True,
+    sqlite_where=Book.is_favorite == True,
+)
+
+# SQLite full-text index over title/author (external content table on books,
+# kept in sync by triggers). Created by init_db; searched by crud.get_books.
+books_fts = table("books_fts", column("rowid"))
+
+BOOKS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS books_fts "
+    "USING fts5(title, author, content='books', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, author) VALUES (new.id, new.title, new.author);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF title, author ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+        INSERT INTO books_fts(rowid, title, author) VALUES (new.id, new.title, new.author);
+    END""",
+)
+
+
+class BookStatsCache(Base):
+    """
+    Single-row table of precomputed reading statistics.
+    Kept in sync with the books table by the CRUD mutators, which also
+    bump its version on every write.
+    """
+    __tablename__ = "book_stats_cache"
+
+    id = Column(Integer, primary_key=True)
+    total_books = Column(Integer, nullable=False, default=0)
+    books_in_progress = Column(Integer, nullable=False, default=0)
+    books_completed = Column(Integer, nullable=False, default=0)
+    books_not_started = Column(Integer, nullable=False, default=0)
+    total_pages_read = Column(Integer, nullable=False, default=0)
+    total_progress = Column(Float, nullable=False, default=0.0)  # Sum of per-book progress percentages
+    # Together, epoch (random, set when the row is created) and version
+    # (bumped by every write) identify the data for read caches and ETags
+    epoch = Column(String(32), nullable=False, default="")
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,59 @@
+"""
+Shared fixtures for the API tests
+
+The engine is created when database.py is imported, so DATABASE_URL must
+point at a throwaway SQLite file before any app module is imported.
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+_db_dir = tempfile.mkdtemp(prefix="reading-tracker-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/test.db"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import database
+from main import app
+
+
+@pytest.fixture
+def client():
+    """TestClient on an empty database, dropped again after the test"""
+    with TestClient(app) as client:
+        yield client
+        client.portal.call(database.drop_db)
+        client.portal.call(database.engine.dispose)
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Context manager recording every SQL statement sent to the database
+
+    Example:
+        with count_queries() as statements:
+            client.get("/books")
+        assert len(statements) <= 2
+    """
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            # Transaction control (SQLite's explicit BEGIN) is not a query
+            if not statement.startswith("BEGIN"):
+                statements.append(statement)
+
+        event.listen(database.engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(database.engine.sync_engine, "before_cursor_execute", record)
+
+    return counter
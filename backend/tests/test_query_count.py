@@ -0,0 +1,65 @@
+"""
+Query-count guards for list endpoints and bulk inserts
+
+A relationship left on lazy="select" turns a list endpoint into one query
+per row (N+1); these tests pin the number of queries regardless of row count.
+"""
+import pytest
+
+import database
+
+
+def create_books(client, count):
+    books = [
+        {"title": f"Book {i}", "author": "Author", "total_pages": 100}
+        for i in range(count)
+    ]
+    response = client.post("/books/bulk", json=books)
+    assert response.status_code == 201
+
+
+@pytest.mark.parametrize("book_count", [1, 30])
+def test_get_books_query_count(client, count_queries, book_count):
+    create_books(client, book_count)
+
+    with count_queries() as statements:
+        response = client.get("/books")
+
+    assert response.status_code == 200
+    assert len(response.json()) == book_count
+    assert len(statements) <= 2, statements
+
+
+def test_get_books_query_count_does_not_grow(client, count_queries):
+    create_books(client, 1)
+    with count_queries() as few:
+        client.get("/books")
+
+    create_books(client, 30)
+    with count_queries() as many:
+        client.get("/books")
+
+    assert len(many) == len(few)
+
+
+def test_bulk_create_returns_rows_from_the_insert(client, count_queries):
+    books = [{"title": f"Book {i}", "author": "Author", "total_pages": 100} for i in range(5)]
+    with count_queries() as statements:
+        response = client.post("/books/bulk", json=books)
+
+    assert response.status_code == 201
+    assert [book["title"] for book in response.json()] == [book["title"] for book in books]
+    assert not any(statement.lstrip().upper().startswith("SELECT") for statement in statements), statements
+
+
+def test_bulk_create_without_multirow_returning(client, monkeypatch):
+    # Dialects such as MySQL cannot RETURNING from an executemany INSERT
+    monkeypatch.setattr(database.engine.dialect, "insert_executemany_returning_sort_by_parameter_order", False)
+
+    books = [{"title": f"Book {i}", "author": "Author", "total_pages": 100} for i in range(3)]
+    response = client.post("/books/bulk", json=books)
+
+    assert response.status_code == 201
+    created = response.json()
+    assert [book["title"] for book in created] == [book["title"] for book in books]
+    assert all(client.get(f"/books/{book['id']}").status_code == 200 for book in created)
@@ -0,0 +1,53 @@
+"""
+Cached /stats and /books/favorites responses must follow writes made
+through any session, since other worker processes share the database
+"""
+import crud
+import database
+from schemas import BookCreate
+
+
+def create_favorite_elsewhere(client):
+    """Create a favorite book the way another worker process would"""
+    async def create():
+        async with database.SessionLocal() as db:
+            await crud.create_book(db, BookCreate(title="Elsewhere", author="B", total_pages=10, is_favorite=True))
+
+    client.portal.call(create)
+
+
+def test_cached_reads_see_writes_from_other_sessions(client):
+    stats = client.get("/stats")
+    favorites = client.get("/books/favorites")
+    assert stats.json()["total_books"] == 0
+    assert favorites.json() == []
+
+    create_favorite_elsewhere(client)
+
+    assert client.get("/stats").json()["total_books"] == 1
+    assert [book["title"] for book in client.get("/books/favorites").json()] == ["Elsewhere"]
+
+
+def test_etag_revalidation(client):
+    first = client.get("/books/favorites")
+    etag = first.headers["ETag"]
+
+    response = client.get("/books/favorites", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    create_favorite_elsewhere(client)
+    response = client.get("/books/favorites", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_does_not_survive_recreating_the_database(client):
+    etag = client.get("/stats").headers["ETag"]
+
+    # The recreated database starts again from the same version number
+    client.portal.call(database.drop_db)
+    client.portal.call(database.init_db)
+
+    response = client.get("/stats", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,63 @@
+"""
+Title/author search, served by the books_fts index on SQLite
+"""
+import pytest
+
+
+@pytest.fixture
+def books(client):
+    created = client.post("/books/bulk", json=[
+        {"title": "The Left Hand of Darkness", "author": "Ursula K. Le Guin", "total_pages": 300},
+        {"title": "A Wizard of Earthsea", "author": "Ursula K. Le Guin", "total_pages": 200},
+        {"title": "Left Behind", "author": "Tim LaHaye", "total_pages": 400},
+    ]).json()
+    return {book["title"]: book["id"] for book in created}
+
+
+def search(client, term):
+    response = client.get("/books", params={"search": term})
+    assert response.status_code == 200
+    return sorted(book["title"] for book in response.json())
+
+
+def test_every_word_must_match_title_or_author(client, books):
+    assert search(client, "left") == ["Left Behind", "The Left Hand of Darkness"]
+    assert search(client, "left guin") == ["The Left Hand of Darkness"]
+    assert search(client, "LEFT Darkness") == ["The Left Hand of Darkness"]
+    assert search(client, "left earthsea") == []
+
+
+def test_words_match_as_prefixes(client, books):
+    assert search(client, "wiz") == ["A Wizard of Earthsea"]
+    assert search(client, "ursu le") == ["A Wizard of Earthsea", "The Left Hand of Darkness"]
+    assert search(client, "izard") == []
+
+
+@pytest.mark.parametrize("term", ['left OR earthsea', 'NOT left', 'left*', '"left', 'title:left', 'NEAR(left hand)', '-', '%'])
+def test_fts_operators_are_treated_as_text(client, books, term):
+    # Must not raise an FTS5 syntax error, and OR/NOT must not combine terms
+    results = search(client, term)
+    assert "A Wizard of Earthsea" not in results
+
+
+def test_search_follows_title_changes(client, books):
+    book_id = books["Left Behind"]
+    client.put(f"/books/{book_id}", json={"title": "Right Ahead"})
+
+    assert search(client, "left") == ["The Left Hand of Darkness"]
+    assert search(client, "right ahead") == ["Right Ahead"]
+    assert search(client, "lahaye") == ["Right Ahead"]
+
+
+def test_search_forgets_deleted_books(client, books):
+    client.delete(f"/books/{books['Left Behind']}")
+
+    assert search(client, "left") == ["The Left Hand of Darkness"]
+    assert search(client, "lahaye") == []
+
+
+def test_search_combines_with_status_filter(client, books):
+    client.patch(f"/books/{books['Left Behind']}/progress", json={"current_page": 10})
+
+    response = client.get("/books", params={"search": "left", "status": "in_progress"})
+    assert [book["title"] for book in response.json()] == ["Left Behind"]
@@ -0,0 +1,138 @@
+"""
+The write-maintained stats cache must always agree with a full
+aggregate over the books table
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import delete, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import crud
+import database
+from models import BookStatsCache
+
+
+def aggregate_stats(client):
+    """GET /stats as computed from scratch over the books table"""
+    async def aggregate():
+        async with database.SessionLocal() as db:
+            return await crud._aggregate_stats(db)
+
+    stats = client.portal.call(aggregate)
+    total_progress = stats.pop("total_progress")
+    total_books = stats["total_books"]
+    stats["average_progress"] = round(total_progress / total_books, 2) if total_books > 0 else 0.0
+    return stats
+
+
+def drop_stats_cache_row(client):
+    """Simulate a database whose cache row does not exist yet"""
+    async def drop():
+        async with database.SessionLocal() as db:
+            await db.execute(delete(BookStatsCache))
+            await db.commit()
+
+    client.portal.call(drop)
+
+
+def assert_stats_consistent(client):
+    response = client.get("/stats")
+    assert response.status_code == 200
+    assert response.json() == aggregate_stats(client)
+
+
+@pytest.mark.parametrize("cache_row_present", [True, False])
+def test_stats_cache_tracks_every_mutation(client, cache_row_present):
+    created = [
+        client.post("/books", json={"title": "First", "author": "A", "total_pages": 100}).json(),
+        client.post(
+            "/books",
+            json={"title": "Second", "author": "B", "total_pages": 200, "current_page": 50, "status": "in_progress"}
+        ).json(),
+    ]
+    created += client.post("/books/bulk", json=[
+        {"title": "Third", "author": "C", "total_pages": 300, "status": "completed"},
+        {"title": "Fourth", "author": "D", "total_pages": 50},
+    ]).json()
+    first, second, third, fourth = (book["id"] for book in created)
+
+    mutations = [
+        lambda: client.patch(f"/books/{first}/progress", json={"current_page": 40}),
+        lambda: client.patch(f"/books/{second}/progress", json={"current_page": 500}),
+        lambda: client.put(f"/books/{third}", json={"status": "not_started"}),
+        lambda: client.put(f"/books/{first}", json={"total_pages": 20}),
+        lambda: client.patch(f"/books/{fourth}/notes", json={"notes": "Skimmed"}),
+        lambda: client.delete(f"/books/{second}"),
+        lambda: client.put(f"/books/{third}", json={"status": "in_progress", "current_page": 10}),
+    ]
+    assert_stats_consistent(client)
+    for mutate in mutations:
+        if not cache_row_present:
+            drop_stats_cache_row(client)
+        assert mutate().status_code < 300
+        assert_stats_consistent(client)
+
+
+def test_stats_read_never_writes(client, count_queries):
+    # A seeding INSERT on the read path races create_book's seeding under
+    # the write lock and fails with a primary-key conflict
+    client.post("/books", json={"title": "Existing", "author": "A", "total_pages": 10, "current_page": 5})
+    drop_stats_cache_row(client)
+
+    with count_queries() as statements:
+        response = client.get("/stats")
+
+    assert response.status_code == 200
+    assert all(statement.lstrip().upper().startswith("SELECT") for statement in statements), statements
+    assert_stats_consistent(client)
+
+
+def test_stats_cache_costs_one_statement_per_write(client, count_queries):
+    book = client.post("/books", json={"title": "Existing", "author": "A", "total_pages": 10}).json()
+
+    with count_queries() as statements:
+        response = client.patch(f"/books/{book['id']}/progress", json={"current_page": 5})
+    assert response.status_code == 200
+    # SELECT book, UPDATE stats cache, UPDATE book, SELECT book
+    assert len(statements) == 4, statements
+
+    with count_queries() as statements:
+        response = client.put(f"/books/{book['id']}", json={"title": "Renamed"})
+    assert response.status_code == 200
+    # Only the data version changes, still in a single UPDATE
+    cache_statements = [statement for statement in statements if "book_stats_cache" in statement]
+    assert len(cache_statements) == 1, statements
+    assert cache_statements[0].lstrip().upper().startswith("UPDATE")
+
+
+def test_stats_cache_consistent_across_engines(client):
+    # A second engine on the same file stands in for another worker process:
+    # it shares the database but not the in-process write lock
+    book_ids = [
+        client.post("/books", json={"title": f"Book {i}", "author": "A", "total_pages": 100}).json()["id"]
+        for i in range(3)
+    ]
+
+    async def write_concurrently():
+        other = create_async_engine(database.DATABASE_URL)
+        event.listen(other.sync_engine, "connect", database.set_sqlite_pragmas)
+        event.listen(other.sync_engine, "connect", database.disable_driver_transactions)
+        event.listen(other.sync_engine, "begin", database.begin_sqlite_transaction)
+
+        async def writer(engine, update_progress, offset):
+            sessions = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+            for i in range(60):
+                async with sessions() as db:
+                    await update_progress(db, book_ids[i % 3], (0, 50, 100)[(i + offset) % 3])
+
+        try:
+            await asyncio.gather(
+                writer(database.engine, crud.update_book_progress, 0),
+                writer(other, crud.update_book_progress.__wrapped__, 1),
+            )
+        finally:
+            await other.dispose()
+
+    client.portal.call(write_concurrently)
+    assert_stats_consistent(client)
@@ -0,0 +1,103 @@
+"""
+init_db must upgrade a database created by the original schema, where
+books.status was a VARCHAR holding status names
+"""
+import sqlite3
+
+import pytest
+
+import database
+
+# books as created by the original models.py (status VARCHAR(50))
+BASELINE_SCHEMA = (
+    """CREATE TABLE books (
+        id INTEGER NOT NULL,
+        title VARCHAR(255) NOT NULL,
+        author VARCHAR(255) NOT NULL,
+        total_pages INTEGER NOT NULL,
+        current_page INTEGER,
+        status VARCHAR(50),
+        cover_url VARCHAR(500),
+        genre VARCHAR(100),
+        notes TEXT,
+        rating FLOAT,
+        is_favorite BOOLEAN,
+        started_at DATETIME,
+        completed_at DATETIME,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id)
+    )""",
+    "CREATE INDEX ix_books_id ON books (id)",
+    "CREATE INDEX ix_books_title ON books (title)",
+)
+
+BASELINE_BOOKS = [
+    (1, "Dune", "Frank Herbert", 400, 0, "not_started", "2024-01-01 00:00:00"),
+    (2, "Emma", "Jane Austen", 300, 120, "in_progress", "2024-01-02 00:00:00"),
+    (3, "Ulysses", "James Joyce", 700, 700, "completed", "2024-01-03 00:00:00"),
+]
+
+
+def database_file():
+    return sqlite3.connect(database.engine.url.database)
+
+
+@pytest.fixture
+def baseline_books():
+    """Create and fill the baseline books table before the app runs init_db"""
+    with database_file() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(statement)
+        conn.executemany(
+            "INSERT INTO books (id, title, author, total_pages, current_page, status, is_favorite, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)",
+            [book + (book[-1],) for book in BASELINE_BOOKS]
+        )
+
+
+@pytest.fixture
+def client(baseline_books, client):
+    """The shared client fixture, started on the baseline database"""
+    return client
+
+
+def test_status_column_is_rebuilt_as_integer(client):
+    with database_file() as conn:
+        column = next(row for row in conn.execute("PRAGMA table_info(books)") if row[1] == "status")
+        types = {row[0] for row in conn.execute("SELECT typeof(status) FROM books")}
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(books)")}
+
+    assert column[2] == "SMALLINT"
+    assert types == {"integer"}
+    assert {"ix_books_title", "ix_books_status_updated"} <= indexes
+
+
+def test_migrated_books_are_served(client):
+    books = client.get("/books").json()
+    assert {book["title"]: book["status"] for book in books} == {
+        "Dune": "not_started",
+        "Emma": "in_progress",
+        "Ulysses": "completed",
+    }
+
+    in_progress = client.get("/books", params={"status": "in_progress"}).json()
+    assert [book["title"] for book in in_progress] == ["Emma"]
+
+    stats = client.get("/stats").json()
+    assert stats["total_books"] == 3
+    assert stats["books_not_started"] == 1
+    assert stats["books_in_progress"] == 1
+    assert stats["books_completed"] == 1
+    assert stats["total_pages_read"] == 820
+
+    assert [book["title"] for book in client.get("/books", params={"search": "austen"}).json()] == ["Emma"]
+
+
+def test_migrated_books_stay_writable(client):
+    response = client.patch("/books/1/progress", json={"current_page": 10})
+    assert response.json()["status"] == "in_progress"
+
+    client.delete("/books/3")
+    assert [book["title"] for book in client.get("/books", params={"search": "ulysses"}).json()] == []
+    assert client.get("/stats").json()["books_completed"] == 0
@@ -0,0 +1,99 @@
+"""
+Status and timestamp transitions applied by PUT /books/{id}
+"""
+import pytest
+
+NEW = "new"  # Set during the PUT (not None, and different from before)
+SAME = "same"  # Unchanged by the PUT
+
+# Starting points: a completed book created through the API has no started_at
+INITIAL_BOOKS = {
+    "not_started": {"current_page": 0, "status": "not_started"},
+    "in_progress": {"current_page": 40, "status": "in_progress"},
+    "completed": {"status": "completed"},
+}
+
+
+@pytest.fixture
+def create_book(client):
+    def create(status):
+        book = client.post("/books", json={"title": "Book", "author": "Author", "total_pages": 100, **INITIAL_BOOKS[status]})
+        return book.json()
+    return create
+
+
+def assert_timestamp(expected, before, after):
+    if expected is NEW:
+        assert after is not None and after != before
+    elif expected is SAME:
+        assert after == before
+    else:
+        assert after is expected
+
+
+@pytest.mark.parametrize("old_status, update, status, started_at, completed_at, current_page", [
+    # Explicit status (every _STATUS_TRANSITIONS cell)
+    ("not_started", {"status": "not_started"}, "not_started", None, None, 0),
+    ("in_progress", {"status": "not_started"}, "not_started", SAME, None, 40),
+    ("completed", {"status": "not_started"}, "not_started", None, SAME, 100),
+    ("not_started", {"status": "in_progress"}, "in_progress", NEW, None, 0),
+    ("in_progress", {"status": "in_progress"}, "in_progress", SAME, None, 40),
+    ("completed", {"status": "in_progress"}, "in_progress", NEW, SAME, 100),
+    ("not_started", {"status": "completed"}, "completed", None, NEW, 100),
+    ("in_progress", {"status": "completed"}, "completed", SAME, NEW, 100),
+    ("completed", {"status": "completed"}, "completed", None, SAME, 100),
+    # Page changes without a status (every _PROGRESS_TRANSITIONS region)
+    ("in_progress", {"current_page": 0}, "not_started", SAME, None, 0),
+    ("not_started", {"current_page": 30}, "in_progress", NEW, None, 30),
+    ("completed", {"current_page": 30}, "in_progress", NEW, SAME, 30),
+    ("in_progress", {"current_page": 100}, "completed", SAME, NEW, 100),
+    ("completed", {"current_page": 100}, "completed", None, SAME, 100),
+    # A status wins over the page it arrives with
+    ("not_started", {"status": "completed", "current_page": 30}, "completed", None, NEW, 30),
+    # Pages are judged and snapped against the new total_pages
+    ("in_progress", {"status": "completed", "total_pages": 250}, "completed", SAME, NEW, 250),
+    ("in_progress", {"current_page": 100, "total_pages": 250}, "in_progress", SAME, None, 100),
+    ("in_progress", {"current_page": 80, "total_pages": 80}, "completed", SAME, NEW, 80),
+])
+def test_update_book_transitions(client, create_book, old_status, update, status, started_at, completed_at, current_page):
+    before = create_book(old_status)
+
+    response = client.put(f"/books/{before['id']}", json=update)
+    assert response.status_code == 200
+    after = response.json()
+
+    assert after["status"] == status
+    assert after["current_page"] == current_page
+    assert_timestamp(started_at, before["started_at"], after["started_at"])
+    assert_timestamp(completed_at, before["completed_at"], after["completed_at"])
+
+
+@pytest.mark.parametrize("update", [{}, {"title": "Book", "current_page": 40, "status": "in_progress"}])
+def test_unchanged_update_writes_nothing(client, count_queries, create_book, update):
+    before = create_book("in_progress")
+    stats_etag = client.get("/stats").headers["ETag"]
+
+    with count_queries() as statements:
+        response = client.put(f"/books/{before['id']}", json=update)
+
+    assert response.status_code == 200
+    assert response.json()["updated_at"] == before["updated_at"]
+    assert not any(statement.lstrip().upper().startswith("UPDATE") for statement in statements), statements
+    assert client.get("/stats", headers={"If-None-Match": stats_etag}).status_code == 304
+
+
+def test_matching_values_still_correct_the_status(client):
+    # Stored as not_started although pages have been read
+    before = client.post(
+        "/books",
+        json={"title": "Book", "author": "Author", "total_pages": 100, "current_page": 40, "status": "not_started"}
+    ).json()
+    assert before["status"] == "not_started"
+
+    response = client.put(f"/books/{before['id']}", json={"current_page": 40})
+
+    after = response.json()
+    assert after["status"] == "in_progress"
+    assert after["started_at"] is not None
+    assert after["updated_at"] != before["updated_at"]
+    assert client.get("/stats").json()["books_in_progress"] == 1